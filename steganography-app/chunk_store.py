@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+PHANTOM CHUNK STORE MODULE - CLASSIFIED
+Content-Defined Chunking with Deduplicated, Content-Addressed Storage
+Ghost Protocol Versioning - New Versions Cost Only What Changed
+"""
+
+import os
+import json
+import hashlib
+import hmac
+import sqlite3
+import threading
+import base64
+from datetime import datetime
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from logging_module import log_phantom_operation, log_phantom_security
+
+try:
+    import numpy as np
+except ImportError:  # Cut points fall back to the scalar gear loop
+    np = None
+
+MASK_64 = (1 << 64) - 1
+
+# Gear table for the rolling fingerprint, derived deterministically so that
+# every store (and every process) cuts identical content at identical points
+GEAR = [
+    int.from_bytes(hashlib.sha256(b"PHANTOM_GEAR_%d" % i).digest()[:8], 'big')
+    for i in range(256)
+]
+GEAR_ARRAY = np.array(GEAR, dtype=np.uint64) if np is not None else None
+
+# Positions fingerprinted per numpy pass; grows so short chunks stay cheap
+CUT_SCAN_WINDOW = 4096
+CUT_SCAN_WINDOW_MAX = 64 * 1024
+
+def _high_bits_mask(bits):
+    """Mask selecting the top `bits` bits of a 64-bit fingerprint"""
+    return ((1 << bits) - 1) << (64 - bits)
+
+def find_cut_point(data, start, end, min_size, avg_size, max_size, mask_small, mask_large):
+    """FastCDC cut point for data[start:end], returned as a chunk length
+    
+    Normalized chunking: a stricter mask before avg_size and a looser one
+    after it pull chunk sizes towards the average. The first min_size bytes
+    are skipped outright since no cut may fall there.
+    """
+    length = end - start
+    if length <= min_size:
+        return length
+    if length > max_size:
+        length = max_size
+    normal = min(avg_size, length)
+    
+    if np is None:
+        return _find_cut_point_scalar(data, start, length, normal, min_size, mask_small, mask_large)
+    
+    # The fingerprint at i is sum(GEAR[byte[i - j]] << j) over the last 64
+    # bytes from min_size on; six shift-and-add doubling passes build it for
+    # a whole window of positions at once
+    view = np.frombuffer(data, dtype=np.uint8, count=length, offset=start)
+    position = min_size
+    window = CUT_SCAN_WINDOW
+    
+    while position < length:
+        stop = min(position + window, length)
+        history = max(min_size, position - 63)
+        fingerprints = GEAR_ARRAY[view[history:stop]]
+        shift = 1
+        while shift < 64:
+            fingerprints[shift:] += fingerprints[:-shift] << np.uint64(shift)
+            shift *= 2
+        fingerprints = fingerprints[position - history:]
+        
+        split = min(max(normal, position), stop) - position
+        cuts = np.flatnonzero(fingerprints[:split] & np.uint64(mask_small) == 0)
+        if not len(cuts):
+            cuts = np.flatnonzero(fingerprints[split:] & np.uint64(mask_large) == 0) + split
+        if len(cuts):
+            return position + int(cuts[0]) + 1
+        
+        position = stop
+        window = min(window * 2, CUT_SCAN_WINDOW_MAX)
+    
+    return length
+
+def _find_cut_point_scalar(data, start, length, normal, min_size, mask_small, mask_large):
+    """Byte-at-a-time gear loop used when numpy is unavailable"""
+    gear = GEAR
+    fingerprint = 0
+    i = min_size
+    
+    while i < normal:
+        fingerprint = ((fingerprint << 1) + gear[data[start + i]]) & MASK_64
+        if not fingerprint & mask_small:
+            return i + 1
+        i += 1
+    
+    while i < length:
+        fingerprint = ((fingerprint << 1) + gear[data[start + i]]) & MASK_64
+        if not fingerprint & mask_large:
+            return i + 1
+        i += 1
+    
+    return length
+
+class PhantomChunkStore:
+    """Deduplicated content-addressed chunk store with versioned manifests"""
+    
+    def __init__(self, store_dir="phantom_chunk_store", password=None,
+                 min_size=16 * 1024, avg_size=64 * 1024, max_size=256 * 1024):
+        self.store_dir = store_dir
+        self.chunks_dir = os.path.join(store_dir, 'chunks')
+        self.manifests_dir = os.path.join(store_dir, 'manifests')
+        self.read_buffer_size = 4 * 1024 * 1024
+        self.lock = threading.Lock()
+        self.setup_directories()
+        self.config = self.load_config(min_size, avg_size, max_size, bool(password))
+        self.setup_index()
+        
+        if self.config['encrypted'] != bool(password):
+            raise ValueError("Store encryption setting does not match: " +
+                             ("password required" if self.config['encrypted'] else "store is not encrypted"))
+        
+        bits = self.config['avg_size'].bit_length() - 1
+        self.mask_small = _high_bits_mask(bits + 1)
+        self.mask_large = _high_bits_mask(bits - 1)
+        
+        self.cipher = None
+        self.id_key = None
+        if password:
+            key = self.derive_key(password, base64.b64decode(self.config['salt']))
+            self.cipher = Fernet(base64.urlsafe_b64encode(key))
+            # Keyed chunk ids so encrypted stores do not leak plaintext hashes
+            self.id_key = hashlib.sha256(b"PHANTOM_CHUNK_ID" + key).digest()
+    
+    def setup_directories(self):
+        """Setup store directory structure"""
+        for directory in [self.store_dir, self.chunks_dir, self.manifests_dir]:
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+    
+    def load_config(self, min_size, avg_size, max_size, encrypted):
+        """Load store parameters, creating them on first use
+        
+        Chunking parameters and the key salt are fixed per store; changing
+        them would stop new versions from deduplicating against old ones.
+        """
+        config_path = os.path.join(self.store_dir, 'store.json')
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                return json.load(f)
+        
+        if not (0 < min_size <= avg_size <= max_size) or avg_size & (avg_size - 1):
+            raise ValueError("Chunk sizes must satisfy min <= avg <= max with avg a power of two")
+        
+        config = {
+            'phantom_version': '3.0',
+            'chunking': 'fastcdc',
+            'min_size': min_size,
+            'avg_size': avg_size,
+            'max_size': max_size,
+            'encrypted': encrypted,
+            'salt': base64.b64encode(os.urandom(16)).decode('ascii'),
+            'created_at': datetime.now().isoformat()
+        }
+        with open(config_path, 'w') as f:
+            json.dump(config, f, indent=2)
+        return config
+    
+    def setup_index(self):
+        """Open the chunk reference-count index"""
+        self.index = sqlite3.connect(
+            os.path.join(self.store_dir, 'index.db'), check_same_thread=False, isolation_level=None
+        )
+        self.index.execute("PRAGMA journal_mode=WAL")
+        self.index.execute("""
+            CREATE TABLE IF NOT EXISTS chunk_refs (
+                chunk_id TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                refcount INTEGER NOT NULL
+            )
+        """)
+    
+    def derive_key(self, password, salt):
+        """Derive the store encryption key from password"""
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=salt,
+            iterations=100000,
+        )
+        return kdf.derive(password.encode())
+    
+    def chunk_id(self, data):
+        """Content address for a chunk"""
+        if self.id_key is not None:
+            return hmac.new(self.id_key, data, hashlib.sha256).hexdigest()
+        return hashlib.sha256(data).hexdigest()
+    
+    def chunk_path(self, chunk_id):
+        """Sharded on-disk location for a chunk id"""
+        return os.path.join(self.chunks_dir, chunk_id[:2], chunk_id[2:4], chunk_id)
+    
+    def iter_chunks(self, file_obj):
+        """Yield content-defined chunks from a binary stream"""
+        min_size = self.config['min_size']
+        avg_size = self.config['avg_size']
+        max_size = self.config['max_size']
+        buffer = bytearray()
+        eof = False
+        
+        while True:
+            if not eof and len(buffer) < max_size:
+                data = file_obj.read(self.read_buffer_size)
+                if data:
+                    buffer += data
+                    continue
+                eof = True
+            
+            if not buffer:
+                return
+            
+            # Cut as many chunks as the buffer can decide; keep the undecidable tail
+            start = 0
+            while len(buffer) - start >= max_size or (eof and start < len(buffer)):
+                length = find_cut_point(buffer, start, len(buffer), min_size, avg_size, max_size,
+                                        self.mask_small, self.mask_large)
+                yield bytes(buffer[start:start + length])
+                start += length
+            del buffer[:start]
+    
+    def store_chunk(self, data):
+        """Write chunk if new; returns (chunk_id, bytes_written)"""
+        chunk_id = self.chunk_id(data)
+        path = self.chunk_path(chunk_id)
+        
+        if os.path.exists(path):
+            return chunk_id, 0
+        
+        payload = self.cipher.encrypt(data) if self.cipher else data
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+        
+        return chunk_id, len(payload)
+    
+    def load_chunk(self, chunk_id):
+        """Read, decrypt and authenticate a chunk"""
+        with open(self.chunk_path(chunk_id), 'rb') as f:
+            payload = f.read()
+        
+        data = self.cipher.decrypt(payload) if self.cipher else payload
+        if not hmac.compare_digest(self.chunk_id(data), chunk_id):
+            raise ValueError(f"Chunk integrity check failed: {chunk_id}")
+        return data
+    
+    def _check_name(self, name, label='name'):
+        """Refuse names that would place a manifest outside manifests_dir"""
+        if not name or name in ('.', '..') or '\0' in name or os.sep in name or \
+                (os.altsep and os.altsep in name):
+            raise ValueError(f"Invalid {label}: {name!r}")
+        return name
+    
+    def put_file(self, file_path, name=None):
+        """Store a new version of a file, writing only chunks not already present"""
+        try:
+            name = self._check_name(name or os.path.basename(file_path))
+            file_hash = hashlib.sha256()
+            chunks = []
+            new_bytes = 0
+            new_chunks = 0
+            
+            # Held for the whole write so garbage_collect cannot reap a chunk
+            # between the existence check and its reference being recorded
+            with self.lock:
+                with open(file_path, 'rb') as f:
+                    for data in self.iter_chunks(f):
+                        file_hash.update(data)
+                        chunk_id, written = self.store_chunk(data)
+                        chunks.append({'id': chunk_id, 'size': len(data)})
+                        if written:
+                            new_chunks += 1
+                            new_bytes += written
+                
+                version = datetime.now().strftime("%Y%m%dT%H%M%S_%f")
+                manifest = {
+                    'name': name,
+                    'version': version,
+                    'size': sum(chunk['size'] for chunk in chunks),
+                    'file_hash': file_hash.hexdigest(),
+                    'encrypted': self.cipher is not None,
+                    'chunk_count': len(chunks),
+                    'chunks': chunks,
+                    'created_at': datetime.now().isoformat()
+                }
+                
+                self._commit_manifest(manifest)
+            
+            log_phantom_operation("CHUNK_STORE_PUT", {
+                "name": name,
+                "version": version,
+                "size": manifest['size'],
+                "chunk_count": len(chunks),
+                "new_chunks": new_chunks,
+                "new_bytes": new_bytes
+            })
+            
+            return manifest
+        
+        except Exception as e:
+            log_phantom_operation("CHUNK_STORE_PUT_ERROR", {"error": str(e)}, "ERROR")
+            return None
+    
+    def _commit_manifest(self, manifest):
+        """Record a manifest's chunk references and publish it as one unit
+        
+        The refcount increments share a transaction that only commits once
+        the manifest has been renamed into place, so a failure part way
+        leaves neither inflated refcounts nor a manifest without references.
+        """
+        manifest_dir = os.path.join(self.manifests_dir, manifest['name'])
+        manifest_path = os.path.join(manifest_dir, f"{manifest['version']}.json")
+        temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        os.makedirs(manifest_dir, exist_ok=True)
+        
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        
+        published = False
+        try:
+            self.index.execute("BEGIN IMMEDIATE")
+            self.index.executemany(
+                "INSERT INTO chunk_refs (chunk_id, size, refcount) VALUES (?, ?, 1) "
+                "ON CONFLICT(chunk_id) DO UPDATE SET refcount = refcount + 1",
+                [(chunk['id'], chunk['size']) for chunk in manifest['chunks']]
+            )
+            os.replace(temp_path, manifest_path)
+            published = True
+            self.index.execute("COMMIT")
+        except BaseException:
+            if self.index.in_transaction:
+                self.index.execute("ROLLBACK")
+            os.remove(manifest_path if published else temp_path)
+            raise
+    
+    def _retire_manifest(self, manifest):
+        """Release a manifest's chunk references and unpublish it as one unit
+        
+        Mirror of _commit_manifest: the decrements only commit once the
+        manifest has been renamed out of the listing, so a failure leaves
+        the version readable with its references intact (caller holds the lock).
+        """
+        manifest_path = os.path.join(self.manifests_dir, manifest['name'], f"{manifest['version']}.json")
+        retired_path = f"{manifest_path}.{os.getpid()}.deleted"
+        
+        retired = False
+        try:
+            self.index.execute("BEGIN IMMEDIATE")
+            self.index.executemany(
+                "UPDATE chunk_refs SET refcount = refcount - 1 WHERE chunk_id = ?",
+                [(chunk['id'],) for chunk in manifest['chunks']]
+            )
+            os.replace(manifest_path, retired_path)
+            retired = True
+            self.index.execute("COMMIT")
+        except BaseException:
+            if self.index.in_transaction:
+                self.index.execute("ROLLBACK")
+            if retired:
+                os.replace(retired_path, manifest_path)
+            raise
+        
+        try:
+            os.remove(retired_path)
+        except OSError:
+            pass  # Already unlisted and unreferenced; only the file is left behind
+    
+    def list_versions(self, name):
+        """List stored versions of a file, oldest first"""
+        manifest_dir = os.path.join(self.manifests_dir, self._check_name(name))
+        if not os.path.isdir(manifest_dir):
+            return []
+        return sorted(entry[:-5] for entry in os.listdir(manifest_dir) if entry.endswith('.json'))
+    
+    def load_manifest(self, name, version=None):
+        """Load a version manifest (latest when version is None)"""
+        versions = self.list_versions(name)
+        if not versions:
+            raise FileNotFoundError(f"No versions stored for: {name}")
+        version = self._check_name(version or versions[-1], 'version')
+        with open(os.path.join(self.manifests_dir, name, f"{version}.json"), 'r') as f:
+            return json.load(f)
+    
+    def get_file(self, name, output_path, version=None):
+        """Reassemble a stored version into output_path"""
+        try:
+            manifest = self.load_manifest(name, version)
+            file_hash = hashlib.sha256()
+            
+            with open(output_path, 'wb') as f:
+                for chunk in manifest['chunks']:
+                    data = self.load_chunk(chunk['id'])
+                    file_hash.update(data)
+                    f.write(data)
+            
+            if file_hash.hexdigest() != manifest['file_hash']:
+                raise ValueError("Reassembled file hash mismatch")
+            
+            log_phantom_operation("CHUNK_STORE_GET", {
+                "name": name,
+                "version": manifest['version'],
+                "output_path": output_path
+            })
+            
+            return output_path
+        
+        except Exception as e:
+            log_phantom_operation("CHUNK_STORE_GET_ERROR", {"error": str(e)}, "ERROR")
+            return None
+    
+    def delete_version(self, name, version):
+        """Drop a version manifest and release its chunk references (latest when version is None)"""
+        try:
+            with self.lock:
+                manifest = self.load_manifest(name, version)
+                version = self._check_name(manifest['version'], 'version')
+                self._retire_manifest(manifest)
+            
+            log_phantom_operation("CHUNK_STORE_VERSION_DELETED", {
+                "name": name,
+                "version": version
+            })
+            
+            return True
+        
+        except Exception as e:
+            log_phantom_operation("CHUNK_STORE_DELETE_ERROR", {"error": str(e)}, "ERROR")
+            return False
+    
+    def garbage_collect(self, secure_delete=None):
+        """Remove chunks no manifest references any more
+        
+        secure_delete, if given, is called with each chunk path instead of
+        os.remove (e.g. PhantomFileManager.secure_delete_file).
+        """
+        try:
+            with self.lock:
+                orphans = self.index.execute(
+                    "SELECT chunk_id, size FROM chunk_refs WHERE refcount <= 0"
+                ).fetchall()
+                
+                freed = 0
+                for chunk_id, size in orphans:
+                    path = self.chunk_path(chunk_id)
+                    if os.path.exists(path):
+                        if secure_delete:
+                            secure_delete(path)
+                        else:
+                            os.remove(path)
+                    freed += size
+                    self.index.execute("DELETE FROM chunk_refs WHERE chunk_id = ?", (chunk_id,))
+            
+            log_phantom_security("CHUNK_STORE_GC_COMPLETED", "INFO", {
+                "chunks_removed": len(orphans),
+                "bytes_freed": freed
+            })
+            
+            return {'chunks_removed': len(orphans), 'bytes_freed': freed}
+        
+        except Exception as e:
+            log_phantom_operation("CHUNK_STORE_GC_ERROR", {"error": str(e)}, "ERROR")
+            return None
+    
+    def get_stats(self):
+        """Get store statistics"""
+        with self.lock:
+            chunk_count, stored_bytes, references = self.index.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(refcount * size), 0) "
+                "FROM chunk_refs WHERE refcount > 0"
+            ).fetchone()
+        
+        return {
+            'store_dir': self.store_dir,
+            'unique_chunks': chunk_count,
+            'stored_bytes': stored_bytes,
+            'logical_bytes': references,
+            'dedup_ratio': references / stored_bytes if stored_bytes else 0,
+            'encrypted': self.cipher is not None
+        }
+    
+    def close(self):
+        """Close the chunk index"""
+        with self.lock:
+            self.index.close()
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+PHANTOM FILE BENCHMARK MODULE - CLASSIFIED
+Offline Throughput and Memory Benchmarks for PhantomFileManager
+Ghost Protocol Performance - Measure Before You Trust
+
+Usage:
+    python file_benchmarks.py --output results.json
+    python file_benchmarks.py --baseline results.json --threshold 0.2
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+import multiprocessing
+import queue as queue_module
+from datetime import datetime
+from logging_module import log_phantom_operation
+from file_utils import PhantomFileManager
+
+try:
+    import resource
+except ImportError:  # Windows has no resource module
+    resource = None
+
+MB = 1024 * 1024
+BENCHMARK_PASSWORD = 'phantom-benchmark'
+
+# Corpus sizes at scale 1.0; --scale multiplies every size and count
+CORPORA = {
+    'text': {'files': 4, 'size': 8 * MB},
+    'random': {'files': 4, 'size': 8 * MB},
+    'small_files': {'files': 2000, 'size': 4 * 1024},
+    'huge': {'files': 2, 'size': 64 * MB}
+}
+
+OPERATIONS = (
+    'create_secure_zip', 'extract_secure_zip', 'encrypt_file', 'decrypt_file',
+    'calculate_file_hash', 'split_file', 'join_file_chunks', 'secure_delete_file'
+)
+
+# Operations that take a worker count and are measured once per --workers value
+WORKER_OPERATIONS = {'extract_secure_zip', 'calculate_file_hash', 'join_file_chunks'}
+
+# Splitting only means something for files larger than one chunk; parts are
+# sized so every file splits into about SPLIT_PARTS pieces at any scale
+SPLIT_PARTS = 4
+SPLIT_CORPORA = {'text', 'random', 'huge'}
+
+TEXT_WORDS = (
+    'phantom ghost protocol secure archive cipher stealth payload vector '
+    'signal channel operator network cache stream block manifest digest'
+).split()
+
+def generate_corpus(kind, directory, scale=1.0, seed=1337):
+    """Write a deterministic synthetic corpus; returns its file paths"""
+    spec = CORPORA[kind]
+    file_count = max(1, int(spec['files'] * (scale if kind == 'small_files' else 1)))
+    file_size = max(1, int(spec['size'] * (1 if kind == 'small_files' else scale)))
+    rng = random.Random(f"{seed}:{kind}")
+    os.makedirs(directory, exist_ok=True)
+    
+    if kind == 'text':
+        # A handful of pseudo-random text blocks reshuffled per file: compresses like logs
+        blocks = [' '.join(rng.choice(TEXT_WORDS) for _ in range(MB // 8)).encode()[:MB] for _ in range(8)]
+    
+    paths = []
+    for index in range(file_count):
+        path = os.path.join(directory, f"{kind}_{index:05d}.bin")
+        with open(path, 'wb') as f:
+            remaining = file_size
+            while remaining > 0:
+                count = min(MB, remaining)
+                if kind == 'text':
+                    f.write(rng.choice(blocks)[:count])
+                else:
+                    f.write(rng.randbytes(count))
+                remaining -= count
+        paths.append(path)
+    
+    return paths
+
+def _link_or_copy(source, destination):
+    """Hardlink a read-only input into a case directory, copying across filesystems"""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+def prepare_case(operation, corpus, files, workers, case_dir):
+    """Build untimed inputs for one case; the timed run only does the operation"""
+    os.makedirs(case_dir, exist_ok=True)
+    file_manager = PhantomFileManager()
+    file_manager.use_hash_cache = False
+    case = {
+        'name': f"{operation}/{corpus}" + (f"/w{workers}" if workers else ''),
+        'operation': operation,
+        'corpus': corpus,
+        'workers': workers,
+        'bytes': sum(os.path.getsize(path) for path in files),
+        'case_dir': case_dir,
+        'inputs': list(files),
+        'chunk_size_mb': max(64 * 1024, min(os.path.getsize(path) for path in files) // SPLIT_PARTS) / MB
+    }
+    
+    try:
+        if operation == 'extract_secure_zip':
+            archive_path = os.path.join(case_dir, 'archive.zip')
+            ok, info = file_manager.create_secure_zip(files, archive_path, BENCHMARK_PASSWORD)
+            if not ok:
+                raise RuntimeError(info)
+            case['inputs'] = [archive_path]
+        
+        elif operation == 'decrypt_file':
+            case['inputs'] = []
+            for path in files:
+                encrypted_path = file_manager.encrypt_file(path, BENCHMARK_PASSWORD)
+                target = os.path.join(case_dir, os.path.basename(encrypted_path))
+                shutil.move(encrypted_path, target)
+                case['inputs'].append(target)
+        
+        elif operation in ('split_file', 'join_file_chunks', 'secure_delete_file'):
+            case['inputs'] = []
+            for path in files:
+                target = os.path.join(case_dir, os.path.basename(path))
+                # Secure delete overwrites in place, so it must never see a hardlink
+                if operation == 'secure_delete_file':
+                    shutil.copyfile(path, target)
+                else:
+                    _link_or_copy(path, target)
+                case['inputs'].append(target)
+            
+            if operation == 'join_file_chunks':
+                manifests = []
+                for path in case['inputs']:
+                    parts = file_manager.split_file(path, case['chunk_size_mb'])
+                    os.remove(path)
+                    manifests.append(parts[-1])
+                case['inputs'] = manifests
+    finally:
+        shutil.rmtree(file_manager.temp_dir, ignore_errors=True)
+    
+    return case
+
+def _peak_rss_bytes():
+    """Peak resident set size of this process
+    
+    On Linux ru_maxrss survives fork+exec, so a spawned child would report
+    at least its parent's peak; VmHWM is reset on exec and so covers this
+    interpreter alone.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def _run_operation(file_manager, case):
+    """Execute one timed operation; returns True on success"""
+    operation = case['operation']
+    inputs = case['inputs']
+    workers = case['workers']
+    
+    if operation == 'create_secure_zip':
+        ok, _ = file_manager.create_secure_zip(inputs, os.path.join(case['case_dir'], 'out.zip'), BENCHMARK_PASSWORD)
+        return ok
+    if operation == 'extract_secure_zip':
+        ok, _ = file_manager.extract_secure_zip(inputs[0], os.path.join(case['case_dir'], 'extracted'),
+                                                BENCHMARK_PASSWORD, streaming=True, workers=workers)
+        return ok
+    if operation == 'encrypt_file':
+        return all(file_manager.encrypt_file(path, BENCHMARK_PASSWORD, output_path=os.path.join(
+            case['case_dir'], os.path.basename(path) + '.phantom_encrypted')) for path in inputs)
+    if operation == 'decrypt_file':
+        return all(file_manager.decrypt_file(path, BENCHMARK_PASSWORD) for path in inputs)
+    if operation == 'calculate_file_hash':
+        return all(digests is not None for digests in file_manager.hash_many(inputs, workers=workers).values())
+    if operation == 'split_file':
+        return all(len(file_manager.split_file(path, case['chunk_size_mb'])) > 1 for path in inputs)
+    if operation == 'join_file_chunks':
+        return all(file_manager.join_file_chunks(manifest, workers=workers) for manifest in inputs)
+    if operation == 'secure_delete_file':
+        return all(file_manager.secure_delete_file(path) for path in inputs)
+    
+    raise ValueError(f"Unknown benchmark operation: {operation}")
+
+def _case_worker(case, results):
+    """Spawned child: run one case so peak RSS belongs to that case alone"""
+    file_manager = None
+    try:
+        file_manager = PhantomFileManager()
+        file_manager.use_hash_cache = False  # Measure hashing, not cache lookups
+        baseline_rss = _peak_rss_bytes()
+        
+        start_time = time.perf_counter()
+        ok = _run_operation(file_manager, case)
+        seconds = time.perf_counter() - start_time
+        
+        results.put({
+            'ok': bool(ok),
+            'seconds': seconds,
+            'baseline_rss_bytes': baseline_rss,
+            'peak_rss_bytes': _peak_rss_bytes()
+        })
+    except Exception as e:
+        results.put({'ok': False, 'error': str(e)})
+    finally:
+        if file_manager is not None:
+            shutil.rmtree(file_manager.temp_dir, ignore_errors=True)
+
+def run_case(case, timeout=1800):
+    """Run a prepared case in a fresh spawned interpreter and summarise it"""
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=_case_worker, args=(case, results))
+    process.start()
+    
+    try:
+        measured = results.get(timeout=timeout)
+    except queue_module.Empty:
+        process.kill()
+        measured = {'ok': False, 'error': f"timed out after {timeout}s"}
+    process.join()
+    
+    result = {key: case[key] for key in ('name', 'operation', 'corpus', 'workers', 'bytes')}
+    result['ok'] = measured.get('ok', False)
+    result['error'] = measured.get('error')
+    
+    seconds = measured.get('seconds')
+    if seconds is not None:
+        result['seconds'] = round(seconds, 4)
+        result['mb_per_s'] = round(case['bytes'] / MB / seconds, 2) if seconds > 0 else None
+    for key in ('peak_rss_bytes', 'baseline_rss_bytes'):
+        if measured.get(key) is not None:
+            result[key.replace('_bytes', '_mb')] = round(measured[key] / MB, 1)
+    
+    return result
+
+def run_benchmarks(operations=OPERATIONS, corpora=tuple(CORPORA), worker_counts=(1, 4), scale=1.0,
+                   work_dir=None, keep=False, timeout=1800):
+    """Generate corpora, run every (operation, corpus, workers) case, return the results document"""
+    root = work_dir or tempfile.mkdtemp(prefix='phantom_bench_')
+    started = time.perf_counter()
+    results = []
+    
+    try:
+        for corpus in corpora:
+            files = generate_corpus(corpus, os.path.join(root, 'corpus', corpus), scale)
+            
+            for operation in operations:
+                if operation in ('split_file', 'join_file_chunks') and corpus not in SPLIT_CORPORA:
+                    continue
+                
+                for workers in (worker_counts if operation in WORKER_OPERATIONS else (None,)):
+                    case_dir = os.path.join(root, 'cases', f"{operation}_{corpus}_{workers or 0}")
+                    try:
+                        case = prepare_case(operation, corpus, files, workers, case_dir)
+                        result = run_case(case, timeout)
+                    finally:
+                        if not keep:
+                            shutil.rmtree(case_dir, ignore_errors=True)
+                    
+                    results.append(result)
+                    print(format_result(result), flush=True)
+    finally:
+        if not keep and work_dir is None:
+            shutil.rmtree(root, ignore_errors=True)
+    
+    document = {
+        'created_at': datetime.now().isoformat(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'scale': scale,
+        'elapsed_seconds': round(time.perf_counter() - started, 2),
+        'results': results
+    }
+    
+    log_phantom_operation("FILE_BENCHMARK_COMPLETED", {
+        "cases": len(results),
+        "failed": [result['name'] for result in results if not result['ok']],
+        "elapsed_seconds": document['elapsed_seconds']
+    })
+    
+    return document
+
+def compare_results(current, baseline, threshold=0.2):
+    """List regressions: throughput below or peak RSS above the baseline by more than threshold"""
+    baseline_cases = {result['name']: result for result in baseline.get('results', []) if result.get('ok')}
+    regressions = []
+    
+    for result in current.get('results', []):
+        reference = baseline_cases.get(result['name'])
+        if reference is None:
+            continue
+        
+        if not result.get('ok'):
+            regressions.append({'name': result['name'], 'metric': 'ok', 'baseline': True, 'current': False})
+            continue
+        
+        if reference.get('mb_per_s') and result.get('mb_per_s') is not None:
+            if result['mb_per_s'] < reference['mb_per_s'] * (1 - threshold):
+                regressions.append({'name': result['name'], 'metric': 'mb_per_s',
+                                    'baseline': reference['mb_per_s'], 'current': result['mb_per_s']})
+        
+        if reference.get('peak_rss_mb') and result.get('peak_rss_mb') is not None:
+            if result['peak_rss_mb'] > reference['peak_rss_mb'] * (1 + threshold):
+                regressions.append({'name': result['name'], 'metric': 'peak_rss_mb',
+                                    'baseline': reference['peak_rss_mb'], 'current': result['peak_rss_mb']})
+    
+    return regressions
+
+def format_result(result):
+    """One-line human readable summary of a case"""
+    if not result['ok']:
+        return f"{result['name']:<40} FAILED  {result.get('error') or ''}"
+    return (f"{result['name']:<40} {result.get('mb_per_s') or 0:>9.1f} MB/s "
+            f"{result.get('peak_rss_mb') or 0:>8.1f} MB peak RSS")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Phantom file manager benchmark suite")
+    parser.add_argument('--output', default='phantom_benchmark_results.json', help="Where to save JSON results")
+    parser.add_argument('--baseline', help="Previous results JSON to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed relative regression (0.2 = 20%%)")
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiply corpus sizes")
+    parser.add_argument('--operations', default=','.join(OPERATIONS), help="Comma-separated operations")
+    parser.add_argument('--corpora', default=','.join(CORPORA), help="Comma-separated corpora")
+    parser.add_argument('--workers', default='1,4', help="Comma-separated worker counts")
+    parser.add_argument('--work-dir', help="Directory for corpora and case files (default: a temp dir)")
+    parser.add_argument('--keep', action='store_true', help="Keep generated corpora and outputs")
+    parser.add_argument('--timeout', type=int, default=1800, help="Per-case timeout in seconds")
+    args = parser.parse_args(argv)
+    
+    operations = [name for name in args.operations.split(',') if name]
+    corpora = [name for name in args.corpora.split(',') if name]
+    unknown = [name for name in operations if name not in OPERATIONS] + [name for name in corpora if name not in CORPORA]
+    if unknown:
+        parser.error(f"unknown operations/corpora: {', '.join(unknown)}")
+    
+    document = run_benchmarks(operations, corpora, [int(count) for count in args.workers.split(',') if count],
+                              args.scale, args.work_dir, args.keep, args.timeout)
+    
+    with open(args.output, 'w') as f:
+        json.dump(document, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+    
+    failed = [result['name'] for result in document['results'] if not result['ok']]
+    if failed:
+        print(f"Failed cases: {', '.join(failed)}")
+    
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare_results(document, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression['name']} {regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['current']}")
+        if regressions:
+            return 1
+    
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+PHANTOM HASH CACHE MODULE - CLASSIFIED
+Persistent Content-Hash Cache Keyed on File Identity
+Ghost Protocol Integrity - Unchanged Files Cost One stat() Call
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from logging_module import log_phantom_operation
+
+def default_cache_path():
+    """Per-user cache database path ($XDG_CACHE_HOME or ~/.cache)"""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'phantom', 'hash_cache.db')
+
+class PhantomHashCache:
+    """Persistent SQLite hash cache keyed on (device, inode, size, mtime_ns, algorithm)
+    
+    The database stores plaintext file digests: anyone who can read it can
+    confirm whether a known file is present. It defaults to a per-user
+    cache directory created owner-only; pass db_path to keep it elsewhere.
+    A hit trusts size and mtime, so integrity checks should not use it.
+    """
+    
+    def __init__(self, db_path=None, max_entries=200000, touch_interval=3600, touch_batch=1000):
+        self.db_path = db_path or default_cache_path()
+        self.max_entries = max_entries
+        self.evict_batch = max(1, max_entries // 100)  # Evict 1% at a time
+        self.touch_interval = touch_interval  # Seconds before a hit refreshes last_used
+        self.touch_batch = touch_batch  # Queued last_used refreshes written per transaction
+        self.pending_touches = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.setup_database()
+    
+    def setup_database(self):
+        """Open the cache database and create the schema"""
+        directory = os.path.dirname(self.db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                device INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                algorithm TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (device, inode, algorithm)
+            )
+        """)
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS file_hashes_last_used ON file_hashes (last_used)"
+        )
+        self.entry_count = self.connection.execute("SELECT COUNT(*) FROM file_hashes").fetchone()[0]
+    
+    def get(self, stat_result, algorithm):
+        """Return cached digest if the file identity is unchanged, else None"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT size, mtime_ns, digest, last_used FROM file_hashes "
+                "WHERE device = ? AND inode = ? AND algorithm = ?",
+                (stat_result.st_dev, stat_result.st_ino, algorithm)
+            ).fetchone()
+            
+            if row is None or row[0] != stat_result.st_size or row[1] != stat_result.st_mtime_ns:
+                self.misses += 1
+                return None
+            
+            # LRU order only needs coarse timestamps: refresh stale ones in batches
+            now = time.time()
+            if now - row[3] >= self.touch_interval:
+                self.pending_touches[(stat_result.st_dev, stat_result.st_ino, algorithm)] = now
+                if len(self.pending_touches) >= self.touch_batch:
+                    self._flush_touches()
+            self.hits += 1
+            return row[2]
+    
+    def flush(self):
+        """Write queued last_used refreshes"""
+        with self.lock:
+            self._flush_touches()
+    
+    def _flush_touches(self):
+        """Write queued last_used refreshes in one transaction (caller holds the lock)"""
+        if not self.pending_touches:
+            return
+        
+        self.connection.execute("BEGIN")
+        try:
+            self.connection.executemany(
+                "UPDATE file_hashes SET last_used = ? WHERE device = ? AND inode = ? AND algorithm = ?",
+                [(used, *key) for key, used in self.pending_touches.items()]
+            )
+            self.connection.execute("COMMIT")
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.pending_touches.clear()
+    
+    def put(self, stat_result, algorithm, digest):
+        """Store digest for a file identity, replacing any stale entry"""
+        with self.lock:
+            replaced = self.connection.execute(
+                "SELECT 1 FROM file_hashes WHERE device = ? AND inode = ? AND algorithm = ?",
+                (stat_result.st_dev, stat_result.st_ino, algorithm)
+            ).fetchone()
+            
+            self.connection.execute(
+                "INSERT OR REPLACE INTO file_hashes "
+                "(device, inode, algorithm, size, mtime_ns, digest, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (stat_result.st_dev, stat_result.st_ino, algorithm, stat_result.st_size,
+                 stat_result.st_mtime_ns, digest, time.time())
+            )
+            
+            if not replaced:
+                self.entry_count += 1
+                if self.entry_count > self.max_entries:
+                    self.evict()
+    
+    def evict(self):
+        """Drop the least recently used entries (caller holds the lock)"""
+        self._flush_touches()
+        excess = self.entry_count - self.max_entries + self.evict_batch
+        self.connection.execute(
+            "DELETE FROM file_hashes WHERE rowid IN "
+            "(SELECT rowid FROM file_hashes ORDER BY last_used LIMIT ?)",
+            (excess,)
+        )
+        self.entry_count = self.connection.execute("SELECT COUNT(*) FROM file_hashes").fetchone()[0]
+        
+        log_phantom_operation("HASH_CACHE_EVICTED", {
+            "evicted": excess,
+            "entries": self.entry_count
+        })
+    
+    def clear(self):
+        """Remove every cached digest"""
+        with self.lock:
+            self.connection.execute("DELETE FROM file_hashes")
+            self.pending_touches.clear()
+            self.entry_count = 0
+    
+    def get_stats(self):
+        """Get cache statistics"""
+        return {
+            'db_path': self.db_path,
+            'entries': self.entry_count,
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'pending_touches': len(self.pending_touches)
+        }
+    
+    def close(self):
+        """Flush queued last_used refreshes and close the cache database"""
+        with self.lock:
+            self._flush_touches()
+            self.connection.close()
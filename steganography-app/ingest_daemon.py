@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+PHANTOM INGEST DAEMON MODULE - CLASSIFIED
+Watch-Folder Ingestion into Encrypted Archives
+Ghost Protocol Intake - Files Land, Settle, and Vanish into Archives
+
+Usage:
+    PHANTOM_INGEST_PASSWORD=... python ingest_daemon.py DROP_DIR ARCHIVE_DIR
+"""
+
+import os
+import sys
+import time
+import errno
+import stat
+import struct
+import select
+import shutil
+import argparse
+import threading
+import ctypes
+import ctypes.util
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from logging_module import log_phantom_operation
+from file_utils import get_phantom_file_manager
+
+MB = 1024 * 1024
+
+class InotifyWatcher:
+    """Directory watcher over the Linux inotify API via ctypes"""
+    
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_Q_OVERFLOW = 0x00004000
+    EVENT_HEADER = struct.Struct('iIII')
+    
+    name = 'inotify'
+    
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, "inotify not available")
+        
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch failed for {directory}")
+    
+    def wait(self, timeout):
+        """Names touched within timeout; None asks the caller for a full rescan"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        
+        names = set()
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            _, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            start = offset + self.EVENT_HEADER.size
+            name = data[start:start + length].rstrip(b'\0')
+            offset = start + length
+            
+            if mask & self.IN_Q_OVERFLOW:
+                return None
+            if name:
+                names.add(os.fsdecode(name))
+        
+        return names
+    
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Fallback watcher: every wait ends in a full directory rescan"""
+    
+    name = 'polling'
+    
+    def __init__(self, stop_event):
+        self.stop_event = stop_event
+    
+    def wait(self, timeout):
+        self.stop_event.wait(timeout)
+        return None
+    
+    def close(self):
+        pass
+
+class PhantomIngestDaemon:
+    """Long-running watch-folder ingestion built on PhantomFileManager
+    
+    New files in watch_dir (top level, dotfiles ignored) become candidates;
+    once size and mtime hold still for stable_seconds they are claimed and
+    batched by count, bytes or age. Each batch is archived on a worker pool
+    to a hidden partial file in output_dir and committed with an atomic
+    rename, after which the sources are disposed of.
+    """
+    
+    def __init__(self, watch_dir, output_dir, password=None, file_manager=None, batch_max_files=100,
+                 batch_max_bytes=256 * MB, batch_max_age=30.0, stable_seconds=2.0, poll_interval=1.0,
+                 workers=2, source_disposal='delete', processed_dir=None, use_inotify=True):
+        if source_disposal not in ('delete', 'secure_delete', 'move'):
+            raise ValueError(f"Unknown source disposal: {source_disposal}")
+        
+        self.watch_dir = os.path.abspath(watch_dir)
+        self.output_dir = os.path.abspath(output_dir)
+        self.password = password
+        self.file_manager = file_manager or get_phantom_file_manager()
+        self.batch_max_files = batch_max_files
+        self.batch_max_bytes = batch_max_bytes
+        self.batch_max_age = batch_max_age
+        self.stable_seconds = stable_seconds
+        self.poll_interval = poll_interval
+        self.workers = workers
+        self.source_disposal = source_disposal
+        self.processed_dir = processed_dir or os.path.join(self.watch_dir, '.phantom_processed')
+        self.use_inotify = use_inotify
+        
+        self.flush_on_stop = True
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.watcher = None
+        self.executor = None
+        self.candidates = {}  # path -> [size, mtime_ns, changed_at, first_seen]
+        self.ready = deque()  # (path, size, mtime_ns, first_seen)
+        self.ready_bytes = 0
+        self.claimed = set()
+        self.ignored = {}  # path -> (size, mtime_ns) of a version that failed to ingest
+        self.in_flight = 0
+        self.batch_sequence = 0
+        
+        self.started_at = None
+        self.files_ingested = 0
+        self.bytes_ingested = 0
+        self.batches_committed = 0
+        self.batches_failed = 0
+        self.latencies = deque(maxlen=10000)
+    
+    def start(self):
+        """Run the daemon on a background thread"""
+        self.thread = threading.Thread(target=self.run, name='phantom_ingest', daemon=True)
+        self.thread.start()
+        return self.thread
+    
+    def stop(self, flush=True, timeout=None):
+        """Stop watching; with flush=True stable files still waiting are archived first"""
+        self.flush_on_stop = flush
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+    
+    def run(self):
+        """Watch loop; returns once stop() is called"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.started_at = time.monotonic()
+        self.watcher = self._create_watcher()
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='phantom_ingest')
+        
+        log_phantom_operation("INGEST_DAEMON_STARTED", {
+            "watch_dir": self.watch_dir,
+            "output_dir": self.output_dir,
+            "watcher": self.watcher.name,
+            "workers": self.workers
+        })
+        
+        try:
+            self._scan_directory()
+            tick = min(self.poll_interval, max(0.05, self.stable_seconds / 2))
+            
+            while not self.stop_event.is_set():
+                changed = self.watcher.wait(tick)
+                if changed is None:
+                    self._scan_directory()
+                else:
+                    for name in changed:
+                        self._observe(os.path.join(self.watch_dir, name))
+                
+                self._promote_stable_files()
+                self._dispatch_batches()
+            
+            if self.flush_on_stop:
+                self._promote_stable_files()
+                self._dispatch_batches(flush=True)
+        finally:
+            self.executor.shutdown(wait=True)
+            self.watcher.close()
+            
+            log_phantom_operation("INGEST_DAEMON_STOPPED", self.get_stats())
+    
+    def _create_watcher(self):
+        """inotify when the platform offers it, polling otherwise"""
+        if self.use_inotify and sys.platform.startswith('linux'):
+            try:
+                return InotifyWatcher(self.watch_dir)
+            except OSError as e:
+                log_phantom_operation("INGEST_INOTIFY_UNAVAILABLE", {"error": str(e)}, "WARNING")
+        return PollingWatcher(self.stop_event)
+    
+    def _scan_directory(self):
+        """Observe every visible regular file in watch_dir"""
+        try:
+            with os.scandir(self.watch_dir) as entries:
+                for entry in entries:
+                    self._observe(entry.path, entry)
+        except OSError as e:
+            log_phantom_operation("INGEST_SCAN_ERROR", {"error": str(e)}, "WARNING")
+    
+    def _observe(self, path, entry=None):
+        """Track a file's size and mtime, noting when it last changed"""
+        if os.path.basename(path).startswith('.') or path in self.claimed:
+            return
+        
+        try:
+            stat_info = entry.stat(follow_symlinks=False) if entry is not None else os.lstat(path)
+        except OSError:
+            self.candidates.pop(path, None)
+            return
+        
+        if not stat.S_ISREG(stat_info.st_mode):
+            return
+        
+        identity = (stat_info.st_size, stat_info.st_mtime_ns)
+        if self.ignored.get(path) == identity:
+            return
+        self.ignored.pop(path, None)
+        
+        now = time.monotonic()
+        candidate = self.candidates.get(path)
+        if candidate is None:
+            self.candidates[path] = [stat_info.st_size, stat_info.st_mtime_ns, now, now]
+        elif (candidate[0], candidate[1]) != identity:
+            candidate[0], candidate[1], candidate[2] = stat_info.st_size, stat_info.st_mtime_ns, now
+    
+    def _promote_stable_files(self):
+        """Claim candidates whose size and mtime have held for stable_seconds"""
+        now = time.monotonic()
+        for path in list(self.candidates):
+            self._observe(path)
+            candidate = self.candidates.get(path)
+            if candidate is None or now - candidate[2] < self.stable_seconds:
+                continue
+            
+            del self.candidates[path]
+            self.claimed.add(path)
+            self.ready.append((path, candidate[0], candidate[1], candidate[3]))
+            self.ready_bytes += candidate[0]
+    
+    def _dispatch_batches(self, flush=False):
+        """Submit batches while a count, size or age threshold is met"""
+        while self.ready:
+            oldest_age = time.monotonic() - self.ready[0][3]
+            due = (len(self.ready) >= self.batch_max_files or self.ready_bytes >= self.batch_max_bytes
+                   or oldest_age >= self.batch_max_age or flush)
+            if not due:
+                return
+            
+            batch = []
+            batch_bytes = 0
+            while self.ready and len(batch) < self.batch_max_files:
+                size = self.ready[0][1]
+                if batch and batch_bytes + size > self.batch_max_bytes:
+                    break
+                batch.append(self.ready.popleft())
+                batch_bytes += size
+            self.ready_bytes -= batch_bytes
+            
+            self.batch_sequence += 1
+            with self.lock:
+                self.in_flight += 1
+            self.executor.submit(self._process_batch, self.batch_sequence, batch)
+    
+    def _process_batch(self, batch_id, batch):
+        """Archive one batch, commit it by rename, then dispose of its sources"""
+        start_time = time.perf_counter()
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        final_path = os.path.join(self.output_dir, f"ingest_{stamp}_{batch_id:06d}.zip")
+        partial_path = os.path.join(self.output_dir, f".{os.path.basename(final_path)}.partial")
+        paths = [path for path, _, _, _ in batch]
+        batch_bytes = sum(size for _, size, _, _ in batch)
+        
+        try:
+            ok, info = self.file_manager.create_secure_zip(paths, partial_path, self.password)
+            if not ok:
+                raise RuntimeError(info)
+            if info['file_count'] != len(paths):
+                raise RuntimeError("Files vanished while archiving")
+            
+            # A file rewritten after it was declared stable must not be dropped as ingested
+            for path, size, mtime_ns, _ in batch:
+                stat_info = os.stat(path)
+                if (stat_info.st_size, stat_info.st_mtime_ns) != (size, mtime_ns):
+                    raise RuntimeError(f"File changed while archiving: {path}")
+            
+            os.replace(partial_path, final_path)
+            self._sync_directory(self.output_dir)
+            
+            for path in paths:
+                self._dispose_source(path)
+            
+            committed_at = time.monotonic()
+            elapsed = time.perf_counter() - start_time
+            with self.lock:
+                self.in_flight -= 1
+                self.batches_committed += 1
+                self.files_ingested += len(paths)
+                self.bytes_ingested += batch_bytes
+                self.latencies.extend(committed_at - first_seen for _, _, _, first_seen in batch)
+                self.claimed.difference_update(paths)
+            
+            log_phantom_operation("INGEST_BATCH_COMMITTED", {
+                "archive_path": final_path,
+                "file_count": len(paths),
+                "bytes": batch_bytes,
+                "seconds": round(elapsed, 3),
+                "mb_per_s": round(batch_bytes / MB / elapsed, 2) if elapsed > 0 else None,
+                "max_latency": round(max(committed_at - first_seen for _, _, _, first_seen in batch), 3)
+            })
+        
+        except Exception as e:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            
+            with self.lock:
+                self.in_flight -= 1
+                self.batches_failed += 1
+                # Release the claims; each version that failed waits until it changes again
+                for path, size, mtime_ns, _ in batch:
+                    self.ignored[path] = (size, mtime_ns)
+                self.claimed.difference_update(paths)
+            
+            log_phantom_operation("INGEST_BATCH_FAILED", {
+                "batch": batch_id,
+                "file_count": len(paths),
+                "error": str(e)
+            }, "ERROR")
+    
+    def _dispose_source(self, path):
+        """Remove or move a source file once its archive is committed"""
+        if self.source_disposal == 'secure_delete':
+            self.file_manager.secure_delete_file(path)
+        elif self.source_disposal == 'move':
+            os.makedirs(self.processed_dir, exist_ok=True)
+            shutil.move(path, os.path.join(self.processed_dir, os.path.basename(path)))
+        else:
+            os.remove(path)
+    
+    def _sync_directory(self, directory):
+        """Make a rename durable where the platform supports directory fsync"""
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    
+    def get_stats(self):
+        """Ingest throughput and latency statistics"""
+        with self.lock:
+            latencies = sorted(self.latencies)
+            uptime = time.monotonic() - self.started_at if self.started_at else 0
+            
+            def percentile(fraction):
+                if not latencies:
+                    return None
+                return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))], 3)
+            
+            return {
+                'watcher': self.watcher.name if self.watcher else None,
+                'uptime_seconds': round(uptime, 2),
+                'files_ingested': self.files_ingested,
+                'bytes_ingested': self.bytes_ingested,
+                'batches_committed': self.batches_committed,
+                'batches_failed': self.batches_failed,
+                'pending_files': len(self.candidates) + len(self.ready),
+                'in_flight_batches': self.in_flight,
+                'throughput_mb_per_s': round(self.bytes_ingested / MB / uptime, 2) if uptime > 0 else None,
+                'files_per_s': round(self.files_ingested / uptime, 2) if uptime > 0 else None,
+                'latency_p50': percentile(0.5),
+                'latency_p95': percentile(0.95),
+                'latency_max': round(latencies[-1], 3) if latencies else None
+            }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Phantom watch-folder ingestion daemon")
+    parser.add_argument('watch_dir', help="Drop directory to watch")
+    parser.add_argument('output_dir', help="Where committed archives are written")
+    parser.add_argument('--max-files', type=int, default=100, help="Files per archive")
+    parser.add_argument('--max-mb', type=float, default=256, help="Bytes per archive, in MB")
+    parser.add_argument('--max-age', type=float, default=30.0, help="Seconds a stable file may wait for a batch")
+    parser.add_argument('--stable-seconds', type=float, default=2.0, help="Quiet period before a file is taken")
+    parser.add_argument('--workers', type=int, default=2, help="Concurrent batches")
+    parser.add_argument('--disposal', choices=('delete', 'secure_delete', 'move'), default='delete',
+                        help="What to do with sources after commit")
+    parser.add_argument('--poll', action='store_true', help="Force polling instead of inotify")
+    args = parser.parse_args()
+    
+    # Read from the environment so the password never shows up in the process list
+    daemon = PhantomIngestDaemon(
+        args.watch_dir, args.output_dir, os.environ.get('PHANTOM_INGEST_PASSWORD') or None,
+        batch_max_files=args.max_files, batch_max_bytes=int(args.max_mb * MB), batch_max_age=args.max_age,
+        stable_seconds=args.stable_seconds, workers=args.workers, source_disposal=args.disposal,
+        use_inotify=not args.poll
+    )
+    
+    print("PHANTOM INGEST DAEMON - WATCHING", daemon.watch_dir)
+    daemon.start()
+    try:
+        while daemon.thread.is_alive():
+            daemon.thread.join(10)
+            print(daemon.get_stats())
+    except KeyboardInterrupt:
+        print("\nStopping, flushing stable files...")
+        daemon.stop()
+        print(daemon.get_stats())
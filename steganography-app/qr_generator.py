@@ -9,38 +9,113 @@ import qrcode
 import json
 import hashlib
 import time
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageColor, ImageDraw, ImageFont
 import os
 import base64
 from logging_module import log_phantom_operation
 
+try:
+    import numpy as np
+except ImportError:  # Renders fall back to qrcode's PIL image factory
+    np = None
+
+BRANDING_STRIP_HEIGHT = 60
+
+# Loaded once per process: the arial.ttf probe raises on most Linux hosts
+branding_fonts = None
+
+def get_branding_fonts():
+    """Get (title, subtitle) branding fonts, loading them on first use"""
+    global branding_fonts
+    if branding_fonts is None:
+        try:
+            # Try to use a better font if available
+            branding_fonts = (ImageFont.truetype("arial.ttf", 16), ImageFont.truetype("arial.ttf", 12))
+        except (OSError, ImportError):
+            # Fallback to default font
+            branding_fonts = (ImageFont.load_default(), ImageFont.load_default())
+    return branding_fonts
+
+class PhantomRenderCache:
+    """Thread-safe LRU for encoded QR matrices and rendered PNGs"""
+    
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+    
+    def __len__(self):
+        return len(self.entries)
+
 class PhantomQRGenerator:
     """Elite QR code generation system with metadata embedding"""
     
     def __init__(self):
         self.output_dir = "phantom_qr_codes"
         self.temp_dir = "temp_qr_assets"
+        self.deterministic_payloads = False  # Leave out timestamps and time-derived ids so equal inputs encode equally
+        self.matrix_cache = PhantomRenderCache(256)
+        self.png_cache = PhantomRenderCache(128)
+        self.branding_strip_cache = PhantomRenderCache(64)  # Subtitle and timestamp lines per (width, minute)
+        self.stamped_strip_cache = PhantomRenderCache(256)  # Finished strips per (qr_type, width, minute)
+        self.disk_cache_dir = None  # e.g. os.path.join(self.temp_dir, 'render_cache') to reuse PNGs across runs
+        self.disk_cache_hits = 0
+        self.fast_render = np is not None  # Vectorised numpy rasteriser instead of drawing module by module
+        self.batch_workers = 1  # Processes for create_batch_qr_codes; 1 renders in-process
+        self.batch_chunk_size = None  # Codes per worker task; None sizes chunks from the batch
+        self.last_batch_stats = {}
         self.setup_directories()
-        
+    
     def setup_directories(self):
         """Setup required directories"""
         for directory in [self.output_dir, self.temp_dir]:
             if not os.path.exists(directory):
                 os.makedirs(directory)
     
-    def generate_metadata_qr(self, file_info, encryption_info=None, sender_info=None):
+    def generate_metadata_qr(self, file_info, encryption_info=None, sender_info=None, deterministic=None):
         """Generate QR code containing file metadata"""
         try:
+            if deterministic is None:
+                deterministic = self.deterministic_payloads
+            
             # Create metadata payload
             metadata = {
                 'phantom_version': '3.0',
                 'file_name': file_info.get('name', 'unknown'),
                 'file_size': file_info.get('size', 0),
-                'file_hash': file_info.get('hash', ''),
-                'timestamp': datetime.now().isoformat(),
-                'operation_id': hashlib.sha256(f"{time.time()}".encode()).hexdigest()[:16]
+                'file_hash': file_info.get('hash', '')
             }
+            if not deterministic:
+                metadata['timestamp'] = datetime.now().isoformat()
+                metadata['operation_id'] = hashlib.sha256(f"{time.time()}".encode()).hexdigest()[:16]
             
             # Add encryption info if provided
             if encryption_info:
@@ -58,28 +133,29 @@ class PhantomQRGenerator:
                     'public_key_hash': sender_info.get('public_key_hash', '')
                 }
             
+            if deterministic:
+                # Content-derived id: stable across calls, still unique per payload
+                metadata['operation_id'] = hashlib.sha256(
+                    json.dumps(metadata, separators=(',', ':'), sort_keys=True).encode()
+                ).hexdigest()[:16]
+            
             # Convert to JSON
             metadata_json = json.dumps(metadata, separators=(',', ':'))
             
-            # Create QR code
-            qr = qrcode.QRCode(
+            # Render QR code with high error correction
+            png = self.render_qr_png(
+                metadata_json,
                 version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_H,  # High error correction
+                error_correction=qrcode.constants.ERROR_CORRECT_H,
                 box_size=10,
                 border=4,
+                fill_color="black",
+                back_color="white"
             )
             
-            qr.add_data(metadata_json)
-            qr.make(fit=True)
-            
-            # Create QR image
-            qr_image = qr.make_image(fill_color="black", back_color="white")
-            
             # Save QR code
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            qr_filename = f"phantom_metadata_{timestamp}.png"
-            qr_path = os.path.join(self.output_dir, qr_filename)
-            qr_image.save(qr_path)
+            qr_path = self._save_qr_png(png, f"phantom_metadata_{timestamp}.png")
             
             log_phantom_operation("METADATA_QR_GENERATED", {
                 "qr_path": qr_path,
@@ -88,14 +164,17 @@ class PhantomQRGenerator:
             })
             
             return qr_path, metadata
-            
+        
         except Exception as e:
             log_phantom_operation("METADATA_QR_ERROR", {"error": str(e)}, "ERROR")
             return None, None
     
-    def generate_steganography_qr(self, stego_info):
+    def generate_steganography_qr(self, stego_info, deterministic=None):
         """Generate QR code for steganography operation info"""
         try:
+            if deterministic is None:
+                deterministic = self.deterministic_payloads
+            
             # Create steganography metadata
             stego_metadata = {
                 'phantom_type': 'STEGANOGRAPHY',
@@ -105,12 +184,17 @@ class PhantomQRGenerator:
                 'stealth_level': stego_info.get('stealth_level', 5),
                 'encryption_enabled': stego_info.get('encrypted', False),
                 'noise_injection': stego_info.get('noise_added', False),
-                'digital_signature': stego_info.get('signed', False),
-                'timestamp': datetime.now().isoformat(),
-                'verification_hash': hashlib.sha256(
+                'digital_signature': stego_info.get('signed', False)
+            }
+            if deterministic:
+                stego_metadata['verification_hash'] = hashlib.sha256(
+                    json.dumps(stego_metadata, separators=(',', ':'), sort_keys=True).encode()
+                ).hexdigest()[:32]
+            else:
+                stego_metadata['timestamp'] = datetime.now().isoformat()
+                stego_metadata['verification_hash'] = hashlib.sha256(
                     f"{stego_info.get('cover_image', '')}{time.time()}".encode()
                 ).hexdigest()[:32]
-            }
             
             # Add extraction instructions
             stego_metadata['extraction_info'] = {
@@ -123,28 +207,22 @@ class PhantomQRGenerator:
             # Convert to JSON
             stego_json = json.dumps(stego_metadata, separators=(',', ':'))
             
-            # Create QR code with custom styling
-            qr = qrcode.QRCode(
+            # Render matrix-style QR code with Phantom branding
+            png = self.render_qr_png(
+                stego_json,
                 version=2,  # Larger version for more data
                 error_correction=qrcode.constants.ERROR_CORRECT_M,
                 box_size=8,
                 border=4,
+                fill_color="#00ff00",
+                back_color="#000000",
+                branding="STEGANOGRAPHY",
+                branding_timestamp=not deterministic
             )
             
-            qr.add_data(stego_json)
-            qr.make(fit=True)
-            
-            # Create styled QR image
-            qr_image = qr.make_image(fill_color="#00ff00", back_color="#000000")  # Matrix style
-            
-            # Add Phantom branding
-            branded_qr = self.add_phantom_branding(qr_image, "STEGANOGRAPHY")
-            
             # Save QR code
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            qr_filename = f"phantom_stego_{timestamp}.png"
-            qr_path = os.path.join(self.output_dir, qr_filename)
-            branded_qr.save(qr_path)
+            qr_path = self._save_qr_png(png, f"phantom_stego_{timestamp}.png")
             
             log_phantom_operation("STEGANOGRAPHY_QR_GENERATED", {
                 "qr_path": qr_path,
@@ -152,14 +230,17 @@ class PhantomQRGenerator:
             })
             
             return qr_path, stego_metadata
-            
+        
         except Exception as e:
             log_phantom_operation("STEGANOGRAPHY_QR_ERROR", {"error": str(e)}, "ERROR")
             return None, None
     
-    def generate_contact_qr(self, contact_info):
+    def generate_contact_qr(self, contact_info, deterministic=None):
         """Generate QR code for contact information"""
         try:
+            if deterministic is None:
+                deterministic = self.deterministic_payloads
+            
             # Create contact metadata
             contact_metadata = {
                 'phantom_type': 'CONTACT',
@@ -173,38 +254,33 @@ class PhantomQRGenerator:
                     'ENCRYPTED_CHAT',
                     'SECURE_FILE_TRANSFER',
                     'VOICE_COMMANDS'
-                ],
-                'timestamp': datetime.now().isoformat(),
-                'contact_hash': hashlib.sha256(
-                    f"{contact_info.get('user_id', '')}{contact_info.get('email', '')}".encode()
-                ).hexdigest()[:16]
+                ]
             }
+            if not deterministic:
+                contact_metadata['timestamp'] = datetime.now().isoformat()
+            contact_metadata['contact_hash'] = hashlib.sha256(
+                f"{contact_info.get('user_id', '')}{contact_info.get('email', '')}".encode()
+            ).hexdigest()[:16]
             
             # Convert to JSON
             contact_json = json.dumps(contact_metadata, separators=(',', ':'))
             
-            # Create QR code
-            qr = qrcode.QRCode(
+            # Render contact QR code with blue theme and contact branding
+            png = self.render_qr_png(
+                contact_json,
                 version=2,
                 error_correction=qrcode.constants.ERROR_CORRECT_L,
                 box_size=10,
                 border=4,
+                fill_color="#0066ff",
+                back_color="white",
+                branding="CONTACT",
+                branding_timestamp=not deterministic
             )
             
-            qr.add_data(contact_json)
-            qr.make(fit=True)
-            
-            # Create contact QR image with blue theme
-            qr_image = qr.make_image(fill_color="#0066ff", back_color="white")
-            
-            # Add contact branding
-            branded_qr = self.add_phantom_branding(qr_image, "CONTACT")
-            
             # Save QR code
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            qr_filename = f"phantom_contact_{timestamp}.png"
-            qr_path = os.path.join(self.output_dir, qr_filename)
-            branded_qr.save(qr_path)
+            qr_path = self._save_qr_png(png, f"phantom_contact_{timestamp}.png")
             
             log_phantom_operation("CONTACT_QR_GENERATED", {
                 "qr_path": qr_path,
@@ -212,14 +288,17 @@ class PhantomQRGenerator:
             })
             
             return qr_path, contact_metadata
-            
+        
         except Exception as e:
             log_phantom_operation("CONTACT_QR_ERROR", {"error": str(e)}, "ERROR")
             return None, None
     
-    def generate_network_info_qr(self, network_data):
+    def generate_network_info_qr(self, network_data, deterministic=None):
         """Generate QR code for network scan results"""
         try:
+            if deterministic is None:
+                deterministic = self.deterministic_payloads
+            
             # Create network info metadata
             network_metadata = {
                 'phantom_type': 'NETWORK_SCAN',
@@ -236,28 +315,22 @@ class PhantomQRGenerator:
             # Convert to JSON
             network_json = json.dumps(network_metadata, separators=(',', ':'))
             
-            # Create QR code
-            qr = qrcode.QRCode(
+            # Render network QR code with red theme for security
+            png = self.render_qr_png(
+                network_json,
                 version=1,
                 error_correction=qrcode.constants.ERROR_CORRECT_M,
                 box_size=10,
                 border=4,
+                fill_color="#ff0000",
+                back_color="white",
+                branding="NETWORK",
+                branding_timestamp=not deterministic
             )
             
-            qr.add_data(network_json)
-            qr.make(fit=True)
-            
-            # Create network QR image with red theme for security
-            qr_image = qr.make_image(fill_color="#ff0000", back_color="white")
-            
-            # Add network branding
-            branded_qr = self.add_phantom_branding(qr_image, "NETWORK")
-            
             # Save QR code
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            qr_filename = f"phantom_network_{timestamp}.png"
-            qr_path = os.path.join(self.output_dir, qr_filename)
-            branded_qr.save(qr_path)
+            qr_path = self._save_qr_png(png, f"phantom_network_{timestamp}.png")
             
             log_phantom_operation("NETWORK_QR_GENERATED", {
                 "qr_path": qr_path,
@@ -265,64 +338,242 @@ class PhantomQRGenerator:
             })
             
             return qr_path, network_metadata
-            
+        
         except Exception as e:
             log_phantom_operation("NETWORK_QR_ERROR", {"error": str(e)}, "ERROR")
             return None, None
     
-    def add_phantom_branding(self, qr_image, qr_type):
+    def render_qr_png(self, data, version=1, error_correction=qrcode.constants.ERROR_CORRECT_M, box_size=10,
+                      border=4, fill_color="black", back_color="white", branding=None, branding_timestamp=True):
+        """Encode and render a payload to PNG bytes, reusing cached work
+        
+        PNGs are cached on every render parameter (plus the branding minute
+        when a timestamp line is drawn), in memory and optionally on disk;
+        a miss still reuses the encoded matrix when only colours differ.
+        """
+        timestamp_text = datetime.now().strftime("%Y-%m-%d %H:%M") if branding and branding_timestamp else None
+        key = (data, version, error_correction, box_size, border, fill_color, back_color, branding,
+               bool(branding_timestamp), timestamp_text)
+        
+        png = self.png_cache.get(key)
+        if png is not None:
+            return png
+        
+        disk_path = None
+        if self.disk_cache_dir:
+            digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()
+            disk_path = os.path.join(self.disk_cache_dir, f"{digest}.png")
+            try:
+                with open(disk_path, 'rb') as f:
+                    png = f.read()
+                self.disk_cache_hits += 1
+                self.png_cache.put(key, png)
+                return png
+            except OSError:
+                pass
+        
+        qr = self._encode_qr(data, version, error_correction, box_size, border)
+        if self.fast_render and np is not None and self._is_plain_color(fill_color) and \
+                self._is_plain_color(back_color):
+            strip = None
+            if branding:
+                width = (qr.modules_count + qr.border * 2) * qr.box_size
+                strip = self._branding_strip(branding, width, timestamp_text, branding_timestamp)
+            qr_image = self._render_matrix_image(qr, fill_color, back_color, strip)
+        else:
+            qr_image = qr.make_image(fill_color=fill_color, back_color=back_color)
+            if branding:
+                qr_image = self.add_phantom_branding(qr_image, branding, timestamp_text, branding_timestamp)
+        
+        buffer = io.BytesIO()
+        qr_image.save(buffer, format='PNG')
+        png = buffer.getvalue()
+        
+        self.png_cache.put(key, png)
+        if disk_path:
+            self._store_cached_png(disk_path, png)
+        
+        return png
+    
+    def _encode_qr(self, data, version, error_correction, box_size, border):
+        """QRCode with its module matrix built, shared between renders of the same payload"""
+        key = (data, version, error_correction, box_size, border)
+        qr = self.matrix_cache.get(key)
+        if qr is None:
+            qr = qrcode.QRCode(
+                version=version,
+                error_correction=error_correction,
+                box_size=box_size,
+                border=border,
+            )
+            qr.add_data(data)
+            qr.make(fit=True)
+            self.matrix_cache.put(key, qr)
+        return qr
+    
+    def _is_plain_color(self, color):
+        """Colour the numpy renderer reproduces exactly: an opaque colour string"""
+        return isinstance(color, str) and color.lower() != 'transparent' and \
+            len(ImageColor.getrgb(color)) == 3
+    
+    def _render_matrix_image(self, qr, fill_color, back_color, strip=None):
+        """Rasterise the module matrix in one pass, matching qrcode's PIL factory pixel for pixel
+        
+        Colours are looked up per module, each module row is widened with
+        np.repeat and then broadcast down box_size pixel rows, so the large
+        array is only ever written once; a branding strip image is copied
+        in below the code as part of the same array.
+        """
+        modules = np.asarray(qr.get_matrix(), dtype=bool)
+        count, box_size = modules.shape[0], qr.box_size
+        size = count * box_size
+        
+        if strip is None and fill_color.lower() == 'black' and back_color.lower() == 'white':
+            # The PIL factory draws black on white as a 1-bit image; keep the same mode
+            pixels = np.empty((size, size), dtype=bool)
+            pixels.reshape(count, box_size, count, box_size)[...] = ~modules[:, None, :, None]
+            return Image.fromarray(pixels)
+        
+        palette = np.array([ImageColor.getrgb(back_color), ImageColor.getrgb(fill_color)], dtype=np.uint8)
+        rows = np.repeat(palette[modules.view(np.uint8)], box_size, axis=1)
+        
+        canvas = np.empty((size + (strip.height if strip is not None else 0), size, 3), dtype=np.uint8)
+        canvas[:size].reshape(count, box_size, size * 3)[...] = rows.reshape(count, 1, size * 3)
+        if strip is not None:
+            canvas[size:] = np.asarray(strip)
+        return Image.fromarray(canvas, 'RGB')
+    
+    def _store_cached_png(self, disk_path, png):
+        """Write a PNG into the disk cache; readers never see a partial file"""
+        try:
+            os.makedirs(self.disk_cache_dir, exist_ok=True)
+            temp_path = f"{disk_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(png)
+            os.replace(temp_path, disk_path)
+        except OSError as e:
+            log_phantom_operation("QR_CACHE_WRITE_ERROR", {"error": str(e)}, "WARNING")
+    
+    def _save_qr_png(self, png, qr_filename):
+        """Write rendered PNG bytes into the output directory"""
+        qr_path = os.path.join(self.output_dir, qr_filename)
+        with open(qr_path, 'wb') as f:
+            f.write(png)
+        return qr_path
+    
+    def get_cache_stats(self):
+        """Get render cache statistics"""
+        return {
+            'matrix_entries': len(self.matrix_cache),
+            'matrix_hits': self.matrix_cache.hits,
+            'matrix_misses': self.matrix_cache.misses,
+            'png_entries': len(self.png_cache),
+            'png_hits': self.png_cache.hits,
+            'png_misses': self.png_cache.misses,
+            'disk_hits': self.disk_cache_hits,
+            'disk_cache_dir': self.disk_cache_dir
+        }
+    
+    def clear_render_cache(self):
+        """Drop in-memory matrices, PNGs and branding strips; the disk cache is left alone"""
+        self.matrix_cache.clear()
+        self.png_cache.clear()
+        self.branding_strip_cache.clear()
+        self.stamped_strip_cache.clear()
+    
+    def add_phantom_branding(self, qr_image, qr_type, timestamp_text=None, include_timestamp=True):
         """Add Phantom branding to QR code"""
         try:
+            # qrcode's image wrapper cannot be pasted; use the PIL image it holds
+            if hasattr(qr_image, 'get_image'):
+                qr_image = qr_image.get_image()
+            
             # Convert to RGB if needed
             if qr_image.mode != 'RGB':
                 qr_image = qr_image.convert('RGB')
             
             # Create new image with space for branding
             width, height = qr_image.size
-            new_height = height + 60  # Add space for text
+            new_height = height + BRANDING_STRIP_HEIGHT  # Add space for text
             
             branded_image = Image.new('RGB', (width, new_height), 'white')
             branded_image.paste(qr_image, (0, 0))
             
-            # Add text
-            draw = ImageDraw.Draw(branded_image)
-            
-            try:
-                # Try to use a better font if available
-                font_title = ImageFont.truetype("arial.ttf", 16)
-                font_subtitle = ImageFont.truetype("arial.ttf", 12)
-            except:
-                # Fallback to default font
-                font_title = ImageFont.load_default()
-                font_subtitle = ImageFont.load_default()
-            
-            # Add title
-            title_text = f"PHANTOM {qr_type}"
-            title_bbox = draw.textbbox((0, 0), title_text, font=font_title)
-            title_width = title_bbox[2] - title_bbox[0]
-            title_x = (width - title_width) // 2
-            draw.text((title_x, height + 5), title_text, fill='black', font=font_title)
-            
-            # Add subtitle
-            subtitle_text = "Scan with Phantom Suite"
-            subtitle_bbox = draw.textbbox((0, 0), subtitle_text, font=font_subtitle)
-            subtitle_width = subtitle_bbox[2] - subtitle_bbox[0]
-            subtitle_x = (width - subtitle_width) // 2
-            draw.text((subtitle_x, height + 25), subtitle_text, fill='gray', font=font_subtitle)
-            
-            # Add timestamp
-            timestamp_text = datetime.now().strftime("%Y-%m-%d %H:%M")
-            timestamp_bbox = draw.textbbox((0, 0), timestamp_text, font=font_subtitle)
-            timestamp_width = timestamp_bbox[2] - timestamp_bbox[0]
-            timestamp_x = (width - timestamp_width) // 2
-            draw.text((timestamp_x, height + 40), timestamp_text, fill='gray', font=font_subtitle)
+            # Add pre-rendered text strip
+            branded_image.paste(self._branding_strip(qr_type, width, timestamp_text, include_timestamp), (0, height))
             
             return branded_image
-            
+        
         except Exception as e:
             log_phantom_operation("QR_BRANDING_ERROR", {"error": str(e)}, "WARNING")
             return qr_image
     
+    def _branding_strip(self, qr_type, width, timestamp_text=None, include_timestamp=True):
+        """Branding strip image for a QR code of the given width
+        
+        The subtitle and timestamp lines are rendered once per (width,
+        minute) and only the title is drawn per qr_type, so batch codes with
+        a distinct title each still reuse the static lines.
+        """
+        if include_timestamp:
+            timestamp_text = timestamp_text or datetime.now().strftime("%Y-%m-%d %H:%M")
+        else:
+            timestamp_text = None
+        
+        key = (qr_type, width, timestamp_text)
+        strip = self.stamped_strip_cache.get(key)
+        if strip is not None:
+            return strip
+        
+        try:
+            font_title, font_subtitle = get_branding_fonts()
+            title_line = (5, f"PHANTOM {qr_type}", 'black', font_title)
+            static_lines = [(25, "Scan with Phantom Suite", 'gray', font_subtitle)]
+            if timestamp_text:
+                static_lines.append((40, timestamp_text, 'gray', font_subtitle))
+            
+            static = self.branding_strip_cache.get((width, timestamp_text))
+            if static is None:
+                static_strip = Image.new('RGB', (width, BRANDING_STRIP_HEIGHT), 'white')
+                ink_boxes = self._draw_branding_lines(static_strip, static_lines)
+                static = (static_strip, min(box[1] for box in ink_boxes))
+                self.branding_strip_cache.put((width, timestamp_text), static)
+            
+            static_strip, static_ink_top = static
+            strip = static_strip.copy()
+            if self._branding_line_box(strip, title_line)[3] <= static_ink_top:
+                self._draw_branding_lines(strip, [title_line])
+            else:
+                # Title ink reaching the lower lines: draw all in the original order so overlaps blend the same
+                strip = Image.new('RGB', (width, BRANDING_STRIP_HEIGHT), 'white')
+                self._draw_branding_lines(strip, [title_line] + static_lines)
+            
+            self.stamped_strip_cache.put(key, strip)
+            return strip
+        
+        except Exception as e:
+            log_phantom_operation("QR_BRANDING_ERROR", {"error": str(e)}, "WARNING")
+            return Image.new('RGB', (width, BRANDING_STRIP_HEIGHT), 'white')
+    
+    def _branding_line_box(self, strip, line):
+        """Ink bounding box of a centred (y, text, fill, font) line on the strip"""
+        y, text, _, font = line
+        draw = ImageDraw.Draw(strip)
+        text_bbox = draw.textbbox((0, 0), text, font=font)
+        text_x = (strip.width - (text_bbox[2] - text_bbox[0])) // 2
+        return draw.textbbox((text_x, y), text, font=font)
+    
+    def _draw_branding_lines(self, strip, lines):
+        """Draw centred (y, text, fill, font) lines in order; returns their ink boxes"""
+        draw = ImageDraw.Draw(strip)
+        ink_boxes = []
+        for y, text, fill, font in lines:
+            text_bbox = draw.textbbox((0, 0), text, font=font)
+            text_x = (strip.width - (text_bbox[2] - text_bbox[0])) // 2
+            draw.text((text_x, y), text, fill=fill, font=font)
+            ink_boxes.append(draw.textbbox((text_x, y), text, font=font))
+        return ink_boxes
+    
     def scan_qr_code(self, qr_image_path):
         """Scan and decode QR code"""
         try:
@@ -350,68 +601,125 @@ class PhantomQRGenerator:
                 })
                 
                 return metadata, None
-                
+            
             except json.JSONDecodeError:
                 # Not JSON, return raw data
                 return {'raw_data': qr_data}, None
-                
+        
         except ImportError:
             return None, "pyzbar library not installed. Install with: pip install pyzbar"
         except Exception as e:
             log_phantom_operation("QR_SCAN_ERROR", {"error": str(e)}, "ERROR")
             return None, str(e)
     
-    def create_batch_qr_codes(self, data_list, qr_type="BATCH"):
-        """Create multiple QR codes from a list of data"""
+    def create_batch_qr_codes(self, data_list, qr_type="BATCH", deterministic=None, workers=None, on_result=None):
+        """Create multiple QR codes from a list of data
+        
+        With workers > 1 codes are rendered on a process pool; on_result is
+        called with (index, path) as codes finish, while the returned list
+        is always in data_list order.
+        """
         try:
-            qr_paths = []
-            
-            for i, data in enumerate(data_list):
-                # Create individual QR code
-                qr = qrcode.QRCode(
-                    version=1,
-                    error_correction=qrcode.constants.ERROR_CORRECT_M,
-                    box_size=10,
-                    border=4,
-                )
-                
-                # Add batch info to data
-                batch_data = {
-                    'phantom_type': qr_type,
-                    'batch_index': i,
-                    'batch_total': len(data_list),
-                    'data': data,
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                qr.add_data(json.dumps(batch_data, separators=(',', ':')))
-                qr.make(fit=True)
-                
-                # Create QR image
-                qr_image = qr.make_image(fill_color="black", back_color="white")
-                
-                # Add branding
-                branded_qr = self.add_phantom_branding(qr_image, f"{qr_type} {i+1}/{len(data_list)}")
-                
-                # Save QR code
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                qr_filename = f"phantom_batch_{qr_type.lower()}_{i+1}_{timestamp}.png"
-                qr_path = os.path.join(self.output_dir, qr_filename)
-                branded_qr.save(qr_path)
-                
-                qr_paths.append(qr_path)
+            start_time = time.perf_counter()
+            workers = workers or self.batch_workers
             
-            log_phantom_operation("BATCH_QR_GENERATED", {
+            qr_paths = [None] * len(data_list)
+            for index, qr_path in self.iter_batch_qr_codes(data_list, qr_type, deterministic, workers):
+                qr_paths[index] = qr_path
+                if on_result:
+                    on_result(index, qr_path)
+            
+            elapsed = time.perf_counter() - start_time
+            self.last_batch_stats = {
                 "qr_count": len(qr_paths),
-                "qr_type": qr_type
-            })
+                "qr_type": qr_type,
+                "workers": workers,
+                "elapsed_seconds": round(elapsed, 3),
+                "codes_per_second": round(len(qr_paths) / elapsed, 1) if elapsed > 0 else None
+            }
             
-            return qr_paths
+            log_phantom_operation("BATCH_QR_GENERATED", self.last_batch_stats)
             
+            return qr_paths
+        
         except Exception as e:
             log_phantom_operation("BATCH_QR_ERROR", {"error": str(e)}, "ERROR")
             return []
     
+    def iter_batch_qr_codes(self, data_list, qr_type="BATCH", deterministic=None, workers=None, chunk_size=None):
+        """Yield (index, path) for each batch code as it is written
+        
+        Worker tasks carry chunks of items so pickling and IPC stay small
+        next to rendering; at most a few chunks per worker are in flight.
+        """
+        if deterministic is None:
+            deterministic = self.deterministic_payloads
+        workers = workers or self.batch_workers
+        total = len(data_list)
+        
+        # One stamp per batch keeps file names consistent however work is spread
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        if workers <= 1 or total <= 1:
+            for index, data in enumerate(data_list):
+                yield index, self._render_batch_item(index, data, qr_type, total, deterministic, timestamp)
+            return
+        
+        chunk_size = chunk_size or self.batch_chunk_size or max(1, min(256, total // (workers * 8)))
+        chunks = ((start, data_list[start:start + chunk_size]) for start in range(0, total, chunk_size))
+        window = workers * 4
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                 initargs=self._batch_worker_state()) as executor:
+            pending = set()
+            for start, items in chunks:
+                pending.add(executor.submit(_render_batch_chunk, start, items, qr_type, total, deterministic,
+                                            timestamp))
+                
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+    
+    def _batch_worker_state(self):
+        """Initializer args that give each pool worker a generator configured like this one"""
+        settings = {name: getattr(self, name) for name in BATCH_WORKER_SETTINGS}
+        cache_sizes = {name: getattr(self, name).max_entries for name in BATCH_WORKER_CACHES}
+        return type(self), settings, cache_sizes
+    
+    def _render_batch_item(self, index, data, qr_type, total, deterministic, timestamp):
+        """Render and save one batch code, returning its path"""
+        # Add batch info to data
+        batch_data = {
+            'phantom_type': qr_type,
+            'batch_index': index,
+            'batch_total': total,
+            'data': data
+        }
+        if not deterministic:
+            batch_data['timestamp'] = datetime.now().isoformat()
+        
+        # Render branded QR code
+        png = self.render_qr_png(
+            json.dumps(batch_data, separators=(',', ':')),
+            version=1,
+            error_correction=qrcode.constants.ERROR_CORRECT_M,
+            box_size=10,
+            border=4,
+            fill_color="black",
+            back_color="white",
+            branding=f"{qr_type} {index+1}/{total}",
+            branding_timestamp=not deterministic
+        )
+        
+        # Save QR code
+        return self._save_qr_png(png, f"phantom_batch_{qr_type.lower()}_{index+1}_{timestamp}.png")
+    
     def embed_qr_in_image(self, qr_path, background_image_path, output_path, position='bottom-right'):
         """Embed QR code into another image"""
         try:
@@ -461,11 +769,34 @@ class PhantomQRGenerator:
             })
             
             return output_path
-            
+        
         except Exception as e:
             log_phantom_operation("QR_EMBED_ERROR", {"error": str(e)}, "ERROR")
             return None
 
+# Per-process generator used by batch workers
+batch_worker_generator = None
+
+# Parent instance attributes copied into each worker so pool output matches in-process output
+BATCH_WORKER_SETTINGS = ('output_dir', 'temp_dir', 'disk_cache_dir', 'fast_render', 'deterministic_payloads')
+BATCH_WORKER_CACHES = ('matrix_cache', 'png_cache', 'branding_strip_cache', 'stamped_strip_cache')
+
+def _init_batch_worker(generator_class, settings, cache_sizes):
+    """Process pool initializer: one generator, and its caches, per worker"""
+    global batch_worker_generator
+    batch_worker_generator = generator_class()
+    for name, value in settings.items():
+        setattr(batch_worker_generator, name, value)
+    for name, max_entries in cache_sizes.items():
+        getattr(batch_worker_generator, name).max_entries = max_entries
+
+def _render_batch_chunk(start, items, qr_type, total, deterministic, timestamp):
+    """Render a chunk of batch items in a worker; returns [(index, path)]"""
+    return [
+        (index, batch_worker_generator._render_batch_item(index, data, qr_type, total, deterministic, timestamp))
+        for index, data in enumerate(items, start)
+    ]
+
 # Global QR generator instance
 phantom_qr_generator = None
 
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+PHANTOM SCRATCH SPACE MODULE - CLASSIFIED
+RAM-Backed Scratch Files for Plaintext Intermediates
+Ghost Protocol Hygiene - Plaintext That Never Touches the Platter
+"""
+
+import os
+import tempfile
+import threading
+from logging_module import log_phantom_operation
+
+SHM_DIR = '/dev/shm'
+
+class PhantomScratchFile:
+    """One scratch intermediate, addressable by path for path-based APIs"""
+    
+    def __init__(self, space, backend, fd, path):
+        self.space = space
+        self.backend = backend
+        self.fd = fd
+        self.path = path
+    
+    @property
+    def in_memory(self):
+        return self.backend != 'disk'
+    
+    @property
+    def size(self):
+        return os.fstat(self.fd).st_size
+    
+    def open(self, mode='rb'):
+        """Open a new file object on the scratch contents"""
+        return open(self.path, mode)
+    
+    def release(self):
+        """Give the scratch file back to its space"""
+        self.space.release(self)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+class PhantomScratchSpace:
+    """Scratch allocator over memfd, /dev/shm or disk with a memory budget
+    
+    Allocations are admitted to the memory backend while the live memory
+    files plus the expected size fit the budget; anything larger spills to
+    disk, where release() hands the file to secure_delete.
+    """
+    
+    def __init__(self, backend='auto', memory_budget=256 * 1024 * 1024, disk_dir=None, secure_delete=None):
+        if backend not in ('auto', 'memfd', 'shm', 'disk'):
+            raise ValueError(f"Unknown scratch backend: {backend}")
+        
+        self.backend = self.resolve_backend(backend)
+        self.memory_budget = memory_budget
+        self.disk_dir = disk_dir or tempfile.gettempdir()
+        self.secure_delete = secure_delete
+        self.lock = threading.Lock()
+        self.live = set()
+        self.memory_allocations = 0
+        self.disk_allocations = 0
+        self.spills = 0
+        self.peak_memory = 0
+    
+    def resolve_backend(self, backend):
+        """Pick the best available memory backend for 'auto'"""
+        if backend != 'auto':
+            return backend
+        if hasattr(os, 'memfd_create'):
+            return 'memfd'
+        if os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK):
+            return 'shm'
+        return 'disk'
+    
+    def allocate(self, expected_size=0, prefix='phantom_scratch_'):
+        """Create a scratch file, in memory when the budget allows"""
+        with self.lock:
+            in_use = self.memory_in_use()
+            backend = self.backend
+            
+            if backend != 'disk' and in_use + expected_size > self.memory_budget:
+                backend = 'disk'
+                self.spills += 1
+                log_phantom_operation("SCRATCH_SPILLED_TO_DISK", {
+                    "expected_size": expected_size,
+                    "memory_in_use": in_use,
+                    "memory_budget": self.memory_budget
+                })
+            
+            scratch = self._create(backend, prefix)
+            self.live.add(scratch)
+            
+            if scratch.in_memory:
+                self.memory_allocations += 1
+            else:
+                self.disk_allocations += 1
+            self.peak_memory = max(self.peak_memory, in_use + (expected_size if scratch.in_memory else 0))
+        
+        return scratch
+    
+    def _create(self, backend, prefix):
+        """Create the backing file, degrading memfd -> shm -> disk on refusal"""
+        if backend == 'memfd':
+            try:
+                fd = os.memfd_create(prefix, os.MFD_CLOEXEC)
+                return PhantomScratchFile(self, 'memfd', fd, f'/proc/self/fd/{fd}')
+            except (AttributeError, OSError):
+                backend = 'shm'
+        
+        if backend == 'shm':
+            try:
+                fd, path = tempfile.mkstemp(prefix=prefix, dir=SHM_DIR)
+                return PhantomScratchFile(self, 'shm', fd, path)
+            except OSError:
+                backend = 'disk'
+        
+        os.makedirs(self.disk_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix=prefix, dir=self.disk_dir)
+        return PhantomScratchFile(self, 'disk', fd, path)
+    
+    def release(self, scratch):
+        """Free a scratch file; only disk spills need overwrite passes"""
+        with self.lock:
+            if scratch not in self.live:
+                return
+            self.live.discard(scratch)
+            self.peak_memory = max(self.peak_memory, self.memory_in_use() + (scratch.size if scratch.in_memory else 0))
+        
+        if scratch.in_memory:
+            # Memory pages are dropped on truncate and zeroed before reuse
+            os.ftruncate(scratch.fd, 0)
+            os.close(scratch.fd)
+            if scratch.backend == 'shm':
+                os.remove(scratch.path)
+        else:
+            os.close(scratch.fd)
+            if self.secure_delete:
+                self.secure_delete(scratch.path)
+            elif os.path.exists(scratch.path):
+                os.remove(scratch.path)
+    
+    def memory_in_use(self):
+        """Bytes currently held by live memory-backed scratch files"""
+        return sum(os.fstat(scratch.fd).st_size for scratch in self.live if scratch.in_memory)
+    
+    def cleanup(self):
+        """Release every live scratch file"""
+        for scratch in list(self.live):
+            self.release(scratch)
+    
+    def get_stats(self):
+        """Get scratch space statistics"""
+        with self.lock:
+            return {
+                'backend': self.backend,
+                'memory_budget': self.memory_budget,
+                'memory_in_use': self.memory_in_use(),
+                'peak_memory': self.peak_memory,
+                'live_files': len(self.live),
+                'memory_allocations': self.memory_allocations,
+                'disk_allocations': self.disk_allocations,
+                'spills': self.spills
+            }
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+PHANTOM SECURE CONTAINER MODULE - CLASSIFIED
+Seekable Block-Encrypted Container Format
+Ghost Protocol Random Access - Decrypt Only the Blocks You Touch
+
+Layout:
+    header  = MAGIC | block_size (u32 BE) | salt (16) | file_id (16)
+    record  = nonce (12) | AES-256-GCM ciphertext | tag (16)
+
+Every record but the last holds exactly block_size plaintext bytes, so any
+plaintext offset maps straight to a record. Each record is authenticated
+with AAD = file_id | index (u64 BE) | final flag, which binds records to
+their position and makes truncation or reordering detectable.
+"""
+
+import os
+import io
+import struct
+from collections import OrderedDict
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+MAGIC = b'PHANTOM_BLOCKS_1'
+HEADER_FORMAT = '>16sI16s16s'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+NONCE_SIZE = 12
+TAG_SIZE = 16
+RECORD_OVERHEAD = NONCE_SIZE + TAG_SIZE
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+def derive_container_key(password, salt):
+    """Derive the AES-256 key for a container from password and its salt"""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=100000,
+    )
+    return kdf.derive(password.encode())
+
+def is_block_container(path):
+    """Check whether a file starts with the block container magic"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+def read_container_header(fileobj):
+    """Parse the header; returns (block_size, salt, file_id)"""
+    fileobj.seek(0)
+    header = fileobj.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE:
+        raise ValueError("Truncated container header")
+    
+    magic, block_size, salt, file_id = struct.unpack(HEADER_FORMAT, header)
+    if magic != MAGIC:
+        raise ValueError("Not a Phantom block container")
+    if block_size <= 0:
+        raise ValueError("Invalid container block size")
+    
+    return block_size, salt, file_id
+
+def _record_aad(file_id, index, final):
+    """Associated data binding a record to its container and position"""
+    return file_id + struct.pack('>QB', index, 1 if final else 0)
+
+class PhantomBlockWriter(io.RawIOBase):
+    """Write-only stream that encrypts plaintext into a block container
+    
+    Not seekable: zipfile detects that and streams members with data
+    descriptors, so an archive can be written straight into the container.
+    
+    With append_at set, an existing container is reopened and everything
+    from that plaintext offset on is replaced; only the block holding the
+    offset is decrypted and re-encrypted, earlier records stay untouched.
+    """
+    
+    def __init__(self, path, password=None, block_size=DEFAULT_BLOCK_SIZE, key=None, salt=None, append_at=None):
+        super().__init__()
+        if append_at is not None:
+            self._open_tail(path, password, key, append_at)
+            return
+        
+        self.block_size = block_size
+        self.salt = salt or os.urandom(16)
+        self.file_id = os.urandom(16)
+        self.aead = AESGCM(key or derive_container_key(password, self.salt))
+        # A writable stream (e.g. a volume splitter) is used as-is and closed with the writer
+        self.fileobj = path if hasattr(path, 'write') else open(path, 'wb')
+        self.fileobj.write(struct.pack(HEADER_FORMAT, MAGIC, block_size, self.salt, self.file_id))
+        self.buffer = bytearray()
+        self.index = 0
+        self.position = 0
+    
+    def _open_tail(self, path, password, key, append_at):
+        """Reposition an existing container so writing resumes at append_at"""
+        with PhantomBlockReader(path, password, key) as reader:
+            if append_at > reader.size:
+                raise ValueError("Append offset beyond end of container")
+            
+            self.block_size, self.salt, self.file_id = reader.block_size, reader.salt, reader.file_id
+            self.aead = AESGCM(reader.key)
+            
+            # The writer always holds back 1..block_size bytes as the
+            # candidate final record, so the block ending at append_at is
+            # reloaded even when append_at sits on a block boundary
+            self.index = (append_at - 1) // self.block_size if append_at else 0
+            start = self.index * self.block_size
+            prefix = reader._block(self.index)[:append_at - start] if append_at else b''
+        
+        self.fileobj = open(path, 'r+b')
+        self.fileobj.truncate(HEADER_SIZE + self.index * (self.block_size + RECORD_OVERHEAD))
+        self.fileobj.seek(0, io.SEEK_END)
+        self.buffer = bytearray(prefix)
+        self.position = append_at
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        """Buffer plaintext, encrypting every block known not to be the last"""
+        if self.closed:
+            raise ValueError("write to closed container")
+        
+        self.buffer += data
+        self.position += len(data)
+        
+        # A block exactly at the buffer end might be the final one; keep it
+        full_blocks = (len(self.buffer) - 1) // self.block_size
+        for i in range(full_blocks):
+            start = i * self.block_size
+            self._write_record(self.buffer[start:start + self.block_size], final=False)
+        if full_blocks:
+            del self.buffer[:full_blocks * self.block_size]
+        
+        return len(data)
+    
+    def tell(self):
+        return self.position
+    
+    def _write_record(self, plaintext, final):
+        nonce = os.urandom(NONCE_SIZE)
+        ciphertext = self.aead.encrypt(nonce, bytes(plaintext), _record_aad(self.file_id, self.index, final))
+        self.fileobj.write(nonce + ciphertext)
+        self.index += 1
+    
+    def close(self):
+        """Encrypt the remaining plaintext as the final record"""
+        if not self.closed:
+            try:
+                self._write_record(self.buffer, final=True)
+                self.buffer = bytearray()
+                self.fileobj.close()
+            finally:
+                super().close()
+
+class PhantomBlockReader(io.RawIOBase):
+    """Seekable read-only view of a block container's plaintext
+    
+    Only the records covering each read are decrypted; a small LRU keeps
+    recently used blocks so zipfile's small reads stay cheap.
+    """
+    
+    def __init__(self, path, password=None, key=None, cache_blocks=8):
+        super().__init__()
+        self.path = path
+        self.fileobj = open(path, 'rb')
+        try:
+            self.block_size, self.salt, self.file_id = read_container_header(self.fileobj)
+            self.key = key or derive_container_key(password, self.salt)
+            self.aead = AESGCM(self.key)
+            self.record_size = self.block_size + RECORD_OVERHEAD
+            
+            payload = os.fstat(self.fileobj.fileno()).st_size - HEADER_SIZE
+            full_records, remainder = divmod(payload, self.record_size)
+            if remainder == 0:
+                if full_records == 0:
+                    raise ValueError("Container has no records")
+                self.record_count = full_records
+                last_length = self.block_size
+            elif remainder >= RECORD_OVERHEAD:
+                self.record_count = full_records + 1
+                last_length = remainder - RECORD_OVERHEAD
+            else:
+                raise ValueError("Truncated container record")
+            
+            self.size = (self.record_count - 1) * self.block_size + last_length
+            self.position = 0
+            self.cache = OrderedDict()
+            self.cache_blocks = cache_blocks
+            
+            # Authenticating the final record up front rejects a wrong
+            # password or a truncated container before any member is read
+            self._block(self.record_count - 1)
+        except Exception:
+            self.fileobj.close()
+            raise
+    
+    def clone(self):
+        """Independent reader over the same container, reusing the derived key"""
+        return PhantomBlockReader(self.path, key=self.key, cache_blocks=self.cache_blocks)
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def tell(self):
+        return self.position
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self.position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self.position = position
+        return position
+    
+    def _block(self, index):
+        """Decrypt and authenticate one record"""
+        block = self.cache.get(index)
+        if block is not None:
+            self.cache.move_to_end(index)
+            return block
+        
+        final = index == self.record_count - 1
+        self.fileobj.seek(HEADER_SIZE + index * self.record_size)
+        record = self.fileobj.read(self.record_size)
+        block = self.aead.decrypt(
+            record[:NONCE_SIZE], record[NONCE_SIZE:], _record_aad(self.file_id, index, final)
+        )
+        
+        self.cache[index] = block
+        if len(self.cache) > self.cache_blocks:
+            self.cache.popitem(last=False)
+        return block
+    
+    def readinto(self, buffer):
+        """Fill buffer from the current position, decrypting only touched blocks"""
+        view = memoryview(buffer).cast('B')
+        filled = 0
+        
+        while filled < len(view) and self.position < self.size:
+            index, offset = divmod(self.position, self.block_size)
+            block = self._block(index)
+            count = min(len(block) - offset, len(view) - filled)
+            view[filled:filled + count] = block[offset:offset + count]
+            filled += count
+            self.position += count
+        
+        return filled
+    
+    def close(self):
+        if not self.closed:
+            self.fileobj.close()
+            self.cache.clear()
+        super().close()
@@ -157,6 +157,7 @@ class PhantomSetup:
             'phantom_logs/encrypted',
             'phantom_reports',
             'phantom_qr_codes',
+            'phantom_cache',
             'temp_report_assets',
             'temp_qr_assets',
             'report_templates'